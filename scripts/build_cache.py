@@ -0,0 +1,56 @@
+"""
+Script pour pré-construire les caches binaires (.npy) des load curves
+Usage: python -m scripts.build_cache [--data-dir src/data50]
+
+À lancer après chaque livraison de CSV (ou dans l'image Docker) : le serveur
+et le clustering chargent alors directement les .npy sans reparser les CSV.
+"""
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from src.loadcurve import load_loadcurve
+
+DATA_DIR = Path(__file__).parent.parent / "src" / "data"
+
+
+def build_cache(csv_path):
+    """Parse un CSV (si son cache est absent ou périmé) et retourne le nombre de lignes."""
+    timestamps, _ = load_loadcurve(csv_path)
+    return len(timestamps)
+
+
+def safe_build_cache(csv_path):
+    """Version de build_cache utilisable dans un pool de processus."""
+    try:
+        return build_cache(csv_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-construit les caches .npy des load curves")
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help="Dossier des CSV clients")
+    args = parser.parse_args()
+
+    csv_files = sorted(args.data_dir.glob("LU_ENO_DELPHI_LU_virtual_ind_*.csv"))
+    print(f"📦 Construction des caches pour {len(csv_files)} clients dans {args.data_dir}...")
+
+    # Chaque fichier est indépendant : on répartit sur tous les cœurs.
+    # Un CSV invalide est signalé sans bloquer les autres (ni le build Docker) :
+    # le serveur le signalera aussi au préchargement.
+    n_built, n_rows = 0, 0
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(safe_build_cache, csv_files, chunksize=8)
+        for csv_file, (rows, error) in zip(csv_files, results):
+            if error is not None:
+                print(f"⚠️ Erreur sur {csv_file}: {error}")
+                continue
+            n_built += 1
+            n_rows += rows
+
+    print(f"✅ {n_built}/{len(csv_files)} caches prêts ({n_rows} lignes au total)")
+
+
+if __name__ == "__main__":
+    main()
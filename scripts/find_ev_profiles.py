@@ -1,40 +1,38 @@
 """
 Script pour trouver des profils EV (pic nocturne)
-Usage: python scripts/find_ev_profiles.py
+Usage: python -m scripts.find_ev_profiles
 """
-import csv
 import os
 from pathlib import Path
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from src.loadcurve import load_loadcurve
 
 DATA_DIR = Path(__file__).parent.parent / "src" / "data"
 
 
 def analyze_customer(csv_path):
     """Analyse un client et retourne son profil."""
-    hourly_values = defaultdict(list)
-    
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            hour = int(row['timestamp'][11:13])
-            value = float(row['value'])
-            hourly_values[hour].append(value)
+    timestamps, values = load_loadcurve(csv_path)
+    hours = timestamps.astype(np.int64) // 3600 % 24
     
     # Profil 24h
-    profile = [sum(hourly_values[h]) / len(hourly_values[h]) if hourly_values[h] else 0 for h in range(24)]
+    sums = np.bincount(hours, weights=values, minlength=24)
+    counts = np.bincount(hours, minlength=24)
+    profile = np.divide(sums, counts, out=np.zeros(24), where=counts > 0)
     
     # Calcul ratio nuit/jour
     night_hours = [22, 23, 0, 1, 2, 3, 4, 5]  # 22h-6h
     day_hours = [10, 11, 12, 13, 14, 15, 16, 17]  # 10h-18h
     
-    night_avg = sum(profile[h] for h in night_hours) / len(night_hours)
-    day_avg = sum(profile[h] for h in day_hours) / len(day_hours)
+    night_avg = profile[night_hours].mean()
+    day_avg = profile[day_hours].mean()
     
     night_ratio = night_avg / day_avg if day_avg > 0 else 1
     
     # Heure du pic
-    peak_hour = profile.index(max(profile))
+    peak_hour = int(profile.argmax())
     
     return {
         'profile': profile,
@@ -45,6 +43,14 @@ def analyze_customer(csv_path):
     }
 
 
+def safe_analyze_customer(csv_path):
+    """Version de analyze_customer utilisable dans un pool de processus."""
+    try:
+        return analyze_customer(csv_path), None
+    except Exception as e:
+        return None, str(e)
+
+
 def main():
     print("🔍 Recherche de profils EV (pic nocturne)...\n")
     
@@ -53,20 +59,22 @@ def main():
     
     results = []
     
-    for i, csv_file in enumerate(csv_files):
-        customer_id = csv_file.stem.split("_")[-1]
-        
-        if (i + 1) % 20 == 0:
-            print(f"   Analysé {i + 1}/{len(csv_files)} clients...")
-        
-        try:
-            analysis = analyze_customer(csv_file)
+    # Chaque client est indépendant : on répartit sur tous les cœurs
+    with ProcessPoolExecutor() as executor:
+        analyses = executor.map(safe_analyze_customer, csv_files, chunksize=8)
+        for i, (csv_file, (analysis, error)) in enumerate(zip(csv_files, analyses)):
+            customer_id = csv_file.stem.split("_")[-1]
+            
+            if (i + 1) % 20 == 0:
+                print(f"   Analysé {i + 1}/{len(csv_files)} clients...")
+            
+            if error is not None:
+                print(f"   ⚠️ Erreur sur {customer_id}: {error}")
+                continue
             results.append({
                 'customer_id': customer_id,
                 **analysis
             })
-        except Exception as e:
-            print(f"   ⚠️ Erreur sur {customer_id}: {e}")
     
     # Trier par ratio nocturne (plus haut = plus EV)
     results.sort(key=lambda x: x['night_ratio'], reverse=True)
@@ -2,8 +2,7 @@
 Génère un profil EV synthétique pour le client 00000
 """
 import csv
-import random
-from datetime import datetime, timedelta
+import numpy as np
 
 OUTPUT_FILE = "src/data/LU_ENO_DELPHI_LU_virtual_ind_00000.csv"
 
@@ -59,75 +58,73 @@ def get_seasonal_factor(month):
 
 
 def generate_ev_data():
-    """Génère 2 ans de données EV."""
-    
-    start_date = datetime(2022, 1, 1, 0, 0, 0)
-    end_date = datetime(2024, 1, 1, 0, 0, 0)
-    
-    data = []
-    current = start_date
-    
-    while current < end_date:
-        hour = current.hour
-        month = current.month
-        
-        # Base value from hourly profile
-        base = HOURLY_PROFILE[hour]
-        
-        # Apply seasonal factor
-        seasonal = get_seasonal_factor(month)
-        
-        # Add some randomness (±15%)
-        noise = random.uniform(0.85, 1.15)
-        
-        # Weekend slightly different (more home time)
-        if current.weekday() >= 5:  # Samedi/Dimanche
-            if 10 <= hour <= 16:
-                noise *= 1.3  # Plus de conso le WE en journée
-        
-        value = base * seasonal * noise
-        
-        data.append({
-            'timestamp': current.strftime("%Y-%m-%d %H:%M:%S"),
-            'value': round(value, 2)
-        })
-        
-        current += timedelta(minutes=15)
-    
-    return data
+    """Génère 2 ans de données EV (timestamps, valeurs) en une passe vectorisée."""
+    
+    timestamps = np.arange(
+        np.datetime64('2022-01-01T00:00:00'),
+        np.datetime64('2024-01-01T00:00:00'),
+        np.timedelta64(15, 'm')
+    ).astype('datetime64[s]')
+    
+    epoch_s = timestamps.astype(np.int64)
+    hours = epoch_s // 3600 % 24
+    months = timestamps.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    weekdays = (epoch_s // 86400 + 3) % 7  # 1970-01-01 était un jeudi
+    
+    # Base value from hourly profile
+    profile = np.array([HOURLY_PROFILE[h] for h in range(24)])
+    base = profile[hours]
+    
+    # Apply seasonal factor
+    seasonal = np.array([get_seasonal_factor(m) for m in range(1, 13)])[months - 1]
+    
+    # Add some randomness (±15%)
+    rng = np.random.default_rng()
+    noise = rng.uniform(0.85, 1.15, len(timestamps))
+    
+    # Weekend slightly different (more home time)
+    weekend_day = (weekdays >= 5) & (hours >= 10) & (hours <= 16)  # Samedi/Dimanche
+    noise[weekend_day] *= 1.3  # Plus de conso le WE en journée
+    
+    values = np.round(base * seasonal * noise, 2)
+    
+    return timestamps, values
 
 
 def main():
     print("🔌 Génération du profil EV pour client 00000...")
     
-    data = generate_ev_data()
+    timestamps, values = generate_ev_data()
     
-    print(f"   {len(data)} points générés (2 ans, 15 min)")
+    print(f"   {len(values)} points générés (2 ans, 15 min)")
     
-    # Écrire le CSV
+    # Écrire le CSV (writerows sur des tuples : pas de dict par ligne)
+    timestamp_strs = np.char.replace(np.datetime_as_string(timestamps), 'T', ' ')
     with open(OUTPUT_FILE, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['timestamp', 'value'])
-        writer.writeheader()
-        writer.writerows(data)
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['timestamp', 'value'])
+        writer.writerows(zip(timestamp_strs.tolist(), values.tolist()))
     
     print(f"✅ Fichier créé: {OUTPUT_FILE}")
     
     # Afficher quelques stats
-    night_vals = [d['value'] for d in data if int(d['timestamp'][11:13]) in [22,23,0,1,2,3,4,5]]
-    day_vals = [d['value'] for d in data if int(d['timestamp'][11:13]) in [10,11,12,13,14,15,16,17]]
+    hours = timestamps.astype(np.int64) // 3600 % 24
+    months = timestamps.astype('datetime64[M]').astype(np.int64) % 12 + 1
     
-    winter_vals = [d['value'] for d in data if int(d['timestamp'][5:7]) in [1,2,11,12]]
-    summer_vals = [d['value'] for d in data if int(d['timestamp'][5:7]) in [6,7,8]]
+    night_vals = values[np.isin(hours, [22, 23, 0, 1, 2, 3, 4, 5])]
+    day_vals = values[np.isin(hours, [10, 11, 12, 13, 14, 15, 16, 17])]
+    
+    winter_vals = values[np.isin(months, [1, 2, 11, 12])]
+    summer_vals = values[np.isin(months, [6, 7, 8])]
     
     print(f"\n📊 Stats du profil:")
-    print(f"   Moyenne nuit (22h-6h):  {sum(night_vals)/len(night_vals):.2f} kWh")
-    print(f"   Moyenne jour (10h-18h): {sum(day_vals)/len(day_vals):.2f} kWh")
-    print(f"   Ratio nuit/jour: {(sum(night_vals)/len(night_vals)) / (sum(day_vals)/len(day_vals)):.2f}")
-    print(f"\n   Moyenne hiver: {sum(winter_vals)/len(winter_vals):.2f} kWh")
-    print(f"   Moyenne été:   {sum(summer_vals)/len(summer_vals):.2f} kWh")
-    print(f"   Ratio hiver/été: {(sum(winter_vals)/len(winter_vals)) / (sum(summer_vals)/len(summer_vals)):.2f}")
+    print(f"   Moyenne nuit (22h-6h):  {night_vals.mean():.2f} kWh")
+    print(f"   Moyenne jour (10h-18h): {day_vals.mean():.2f} kWh")
+    print(f"   Ratio nuit/jour: {night_vals.mean() / day_vals.mean():.2f}")
+    print(f"\n   Moyenne hiver: {winter_vals.mean():.2f} kWh")
+    print(f"   Moyenne été:   {summer_vals.mean():.2f} kWh")
+    print(f"   Ratio hiver/été: {winter_vals.mean() / summer_vals.mean():.2f}")
 
 
 if __name__ == "__main__":
     main()
-
@@ -5,18 +5,20 @@ Usage:
     python -m src.clustering --find-optimal --sample 300
 """
 import os
-import csv
 import json
+import hashlib
 import random
 import argparse
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 
+from src.loadcurve import load_loadcurve, LOADCURVE_DTYPE
+
 # Essayer d'importer sklearn, sinon donner des instructions
 try:
-    from sklearn.cluster import KMeans
+    from sklearn.cluster import KMeans, MiniBatchKMeans
     from sklearn.metrics import silhouette_score
 except ImportError:
     print("❌ sklearn non installé. Exécute: pip install scikit-learn")
@@ -24,6 +26,8 @@ except ImportError:
 
 DATA_DIR = Path(__file__).parent / "data"
 OUTPUT_FILE = Path(__file__).parent / "clusters.json"
+# À incrémenter à chaque changement du calcul des features (invalide les caches .npz)
+FEATURES_VERSION = 1
 
 
 def extract_customer_id(filepath: Path) -> str:
@@ -36,43 +40,39 @@ def extract_customer_id(filepath: Path) -> str:
 def extract_features(csv_path: Path) -> dict:
     """Extrait les features d'un fichier CSV loadcurve."""
     
-    hourly_values = defaultdict(list)  # {0: [...], 1: [...], ..., 23: [...]}
-    monthly_values = defaultdict(list)  # {1: [...], 2: [...], ..., 12: [...]}
-    
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            ts = datetime.strptime(row['timestamp'], "%Y-%m-%d %H:%M:%S")
-            value = float(row['value'])
-            
-            hourly_values[ts.hour].append(value)
-            monthly_values[ts.month].append(value)
+    timestamps, values = load_loadcurve(csv_path)
+    hours = timestamps.astype(np.int64) // 3600 % 24
+    months = timestamps.astype('datetime64[M]').astype(np.int64) % 12 + 1
     
     # 1. Profil journalier moyen (24 valeurs)
-    hourly_profile = np.array([
-        np.mean(hourly_values[h]) if hourly_values[h] else 0 
-        for h in range(24)
-    ])
+    hourly_sums = np.bincount(hours, weights=values, minlength=24)
+    hourly_counts = np.bincount(hours, minlength=24)
+    hourly_profile = np.divide(
+        hourly_sums, hourly_counts,
+        out=np.zeros(24, dtype=np.float32), where=hourly_counts > 0
+    )
     
     # 2. Saisonnalité
     winter_months = [11, 12, 1, 2]
     summer_months = [6, 7, 8]
     
-    winter_values = [v for m in winter_months for v in monthly_values.get(m, [])]
-    summer_values = [v for m in summer_months for v in monthly_values.get(m, [])]
+    monthly_sums = np.bincount(months, weights=values, minlength=13)
+    monthly_counts = np.bincount(months, minlength=13)
+    
+    winter_count = monthly_counts[winter_months].sum()
+    summer_count = monthly_counts[summer_months].sum()
     
-    winter_avg = np.mean(winter_values) if winter_values else 1
-    summer_avg = np.mean(summer_values) if summer_values else 1
+    winter_avg = monthly_sums[winter_months].sum() / winter_count if winter_count else 1
+    summer_avg = monthly_sums[summer_months].sum() / summer_count if summer_count else 1
     ratio_winter_summer = winter_avg / summer_avg if summer_avg > 0 else 1.0
     
-    # 3. Variabilité (coefficient de variation)
-    all_values = [v for hour_vals in hourly_values.values() for v in hour_vals]
-    mean_val = np.mean(all_values) if all_values else 1
-    std_val = np.std(all_values) if all_values else 0
-    variability = std_val / mean_val if mean_val > 0 else 0
+    # 3. Total kWh (déjà contenu dans les sommes mensuelles, pas de nouvelle passe)
+    total_kwh = float(monthly_sums.sum())
     
-    # 4. Total kWh
-    total_kwh = sum(all_values)
+    # 4. Variabilité (coefficient de variation)
+    mean_val = total_kwh / values.size if values.size else 1
+    std_val = values.std(dtype=np.float64) if values.size else 0
+    variability = std_val / mean_val if mean_val > 0 else 0
     
     return {
         'hourly_profile': hourly_profile,
@@ -82,6 +82,72 @@ def extract_features(csv_path: Path) -> dict:
     }
 
 
+def safe_extract_features(csv_path: Path) -> tuple:
+    """Version de extract_features utilisable dans un pool de processus.
+    
+    Retourne (features, None) ou (None, message d'erreur).
+    """
+    try:
+        return extract_features(csv_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def features_cache_path(csv_files: list) -> Path:
+    """Chemin du cache .npz des features pour cet ensemble de fichiers.
+    
+    La clé dépend des chemins et des dates de modification : tout CSV
+    ajouté, retiré ou modifié produit un nouveau cache. Elle inclut aussi
+    FEATURES_VERSION et LOADCURVE_DTYPE, pour qu'un changement de calcul
+    ne réutilise pas des features obsolètes.
+    """
+    key_src = str((FEATURES_VERSION, LOADCURVE_DTYPE,
+                   sorted((str(p), p.stat().st_mtime) for p in csv_files)))
+    cache_key = hashlib.sha1(key_src.encode()).hexdigest()[:16]
+    return DATA_DIR / f"features_{cache_key}.npz"
+
+
+def save_features_cache(cache_path: Path, customers_data: dict):
+    """Sauvegarde les features de tous les clients dans un seul .npz.
+    
+    L'écriture passe par un fichier temporaire (jamais de cache tronqué) et
+    les caches d'anciennes versions des CSV sont supprimés.
+    """
+    customer_ids = list(customers_data)
+    tmp_path = cache_path.with_suffix('.npz.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                customer_ids=np.array(customer_ids),
+                hourly_profile=np.stack([customers_data[c]['hourly_profile'] for c in customer_ids]),
+                ratio_winter_summer=np.array([customers_data[c]['ratio_winter_summer'] for c in customer_ids]),
+                variability=np.array([customers_data[c]['variability'] for c in customer_ids]),
+                total_kwh=np.array([customers_data[c]['total_kwh'] for c in customer_ids])
+            )
+        os.replace(tmp_path, cache_path)
+        for old_cache in cache_path.parent.glob("features_*.npz"):
+            if old_cache != cache_path:
+                old_cache.unlink()
+    except OSError:
+        # Dossier en lecture seule : on réextrait au prochain run
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_features_cache(cache_path: Path) -> dict:
+    """Recharge les features sauvegardées par save_features_cache."""
+    with np.load(cache_path) as cache:
+        return {
+            str(customer_id): {
+                'hourly_profile': cache['hourly_profile'][i],
+                'ratio_winter_summer': float(cache['ratio_winter_summer'][i]),
+                'variability': float(cache['variability'][i]),
+                'total_kwh': float(cache['total_kwh'][i])
+            }
+            for i, customer_id in enumerate(cache['customer_ids'])
+        }
+
+
 def prepare_feature_matrix(customers_data: dict) -> np.ndarray:
     """Prépare la matrice de features normalisée et pondérée."""
     
@@ -108,7 +174,7 @@ def prepare_feature_matrix(customers_data: dict) -> np.ndarray:
         features.append(vector)
         customer_ids.append(customer_id)
     
-    X = np.array(features)
+    X = np.array(features, dtype=np.float32)  # Largement suffisant pour KMeans
     
     # Pondérer les features saisonnières (plus d'importance)
     X[:, 24] *= 3.0  # ratio_winter_summer ×3
@@ -125,12 +191,16 @@ def find_optimal_clusters(X: np.ndarray, k_range=range(3, 12)) -> int:
     
     results = []
     
+    # MiniBatchKMeans suffit pour comparer les k ; le fit final reste un KMeans complet
     for k in k_range:
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+        kmeans = MiniBatchKMeans(n_clusters=k, random_state=42, n_init=3, batch_size=256)
         labels = kmeans.fit_predict(X)
         
         inertia = kmeans.inertia_
-        silhouette = silhouette_score(X, labels)
+        # Silhouette en O(N²) : un échantillon suffit pour comparer les k
+        silhouette = silhouette_score(
+            X, labels, sample_size=min(len(X), 200), random_state=42
+        )
         
         results.append({
             'k': k,
@@ -149,40 +219,30 @@ def find_optimal_clusters(X: np.ndarray, k_range=range(3, 12)) -> int:
     return best['k']
 
 
-def assign_cluster_names(kmeans, X, customer_ids, customers_data) -> dict:
-    """Assigne des noms aux clusters basés sur leurs caractéristiques."""
-    
-    cluster_stats = defaultdict(lambda: {
-        'count': 0,
-        'ratios': [],
-        'peak_hours': [],
-        'profiles': []
-    })
-    
-    labels = kmeans.predict(X)
-    
-    for i, (customer_id, label) in enumerate(zip(customer_ids, labels)):
-        data = customers_data[customer_id]
-        cluster_stats[label]['count'] += 1
-        cluster_stats[label]['ratios'].append(data['ratio_winter_summer'])
-        cluster_stats[label]['profiles'].append(data['hourly_profile'])
-        
-        # Trouver les heures de pic
-        profile = data['hourly_profile']
-        peak_hour = np.argmax(profile)
-        cluster_stats[label]['peak_hours'].append(peak_hour)
+def assign_cluster_names(labels, customer_ids, customers_data) -> dict:
+    """Assigne des noms aux clusters basés sur leurs caractéristiques.
+    
+    `labels` vient directement du fit_predict : pas de second predict.
+    """
+    
+    profiles = np.stack([customers_data[c]['hourly_profile'] for c in customer_ids])
+    ratios = np.array([customers_data[c]['ratio_winter_summer'] for c in customer_ids])
+    
+    # Heures de pic de tous les clients en un seul appel
+    all_peak_hours = profiles.argmax(axis=1)
     
     cluster_definitions = {}
     
-    for cluster_id, stats in cluster_stats.items():
-        avg_ratio = np.mean(stats['ratios'])
-        avg_profile = np.mean(stats['profiles'], axis=0)
-        peak_hours = stats['peak_hours']
+    for cluster_id in np.unique(labels):
+        in_cluster = labels == cluster_id
+        avg_ratio = ratios[in_cluster].mean()
+        avg_profile = profiles[in_cluster].mean(axis=0)
+        peak_hours = all_peak_hours[in_cluster]
         
         # Déterminer le nom basé sur les caractéristiques
-        avg_peak = np.mean(peak_hours)
-        night_peaks = sum(1 for h in peak_hours if h >= 22 or h <= 5)
-        night_ratio = night_peaks / len(peak_hours) if peak_hours else 0
+        avg_peak = peak_hours.mean()
+        night_peaks = np.count_nonzero((peak_hours >= 22) | (peak_hours <= 5))
+        night_ratio = night_peaks / len(peak_hours) if len(peak_hours) else 0
         
         # Logique de nommage
         if avg_ratio > 2.5:
@@ -207,7 +267,7 @@ def assign_cluster_names(kmeans, X, customer_ids, customers_data) -> dict:
         cluster_definitions[str(cluster_id)] = {
             'name': name,
             'description': description,
-            'count': stats['count'],
+            'count': int(in_cluster.sum()),
             'avg_ratio_winter_summer': round(avg_ratio, 2),
             'centroid': [round(x, 3) for x in avg_profile.tolist()]
         }
@@ -234,24 +294,38 @@ def main():
         return
     
     # 2. Échantillonner si demandé
-    if args.sample > 0 and args.sample < len(csv_files):
+    sampled = 0 < args.sample < len(csv_files)
+    if sampled:
         csv_files = random.sample(csv_files, args.sample)
         print(f"📊 Échantillon de {len(csv_files)} fichiers")
     
-    # 3. Extraire les features
-    print(f"\n⏳ Extraction des features...")
-    customers_data = {}
-    
-    for i, csv_file in enumerate(csv_files):
-        if (i + 1) % 50 == 0 or i == len(csv_files) - 1:
-            print(f"   {i + 1}/{len(csv_files)} fichiers traités", end='\r')
+    # 3. Extraire les features (ou les recharger si les fichiers n'ont pas changé).
+    # Pas de cache pour un échantillon : chaque tirage aurait sa propre clé.
+    cache_path = None if sampled else features_cache_path(csv_files)
+    if cache_path is not None and cache_path.exists():
+        print(f"\n⚡ Features rechargées depuis {cache_path.name}")
+        customers_data = load_features_cache(cache_path)
+    else:
+        print(f"\n⏳ Extraction des features...")
+        customers_data = {}
+        n_errors = 0
+        
+        # Chaque fichier est indépendant : on répartit sur tous les cœurs
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(safe_extract_features, csv_files, chunksize=8)
+            for i, (csv_file, (features, error)) in enumerate(zip(csv_files, results)):
+                if (i + 1) % 50 == 0 or i == len(csv_files) - 1:
+                    print(f"   {i + 1}/{len(csv_files)} fichiers traités", end='\r')
+                
+                if error is not None:
+                    print(f"\n⚠️ Erreur sur {csv_file}: {error}")
+                    n_errors += 1
+                    continue
+                customers_data[extract_customer_id(csv_file)] = features
         
-        customer_id = extract_customer_id(csv_file)
-        try:
-            features = extract_features(csv_file)
-            customers_data[customer_id] = features
-        except Exception as e:
-            print(f"\n⚠️ Erreur sur {csv_file}: {e}")
+        # Un cache incomplet exclurait ces clients des runs suivants
+        if cache_path is not None and n_errors == 0:
+            save_features_cache(cache_path, customers_data)
     
     print(f"\n✅ {len(customers_data)} clients traités")
     
@@ -276,7 +350,7 @@ def main():
     labels = kmeans.fit_predict(X)
     
     # 7. Assigner les noms aux clusters
-    cluster_definitions = assign_cluster_names(kmeans, X, customer_ids, customers_data)
+    cluster_definitions = assign_cluster_names(labels, customer_ids, customers_data)
     
     # 8. Créer le mapping customer → cluster
     customer_clusters = {
@@ -1,4 +1,3 @@
-from .mock_data import MOCK_CUSTOMERS, MOCK_CONSUMPTIONS, MOCK_CONTRACTS
-
-__all__ = ["MOCK_CUSTOMERS", "MOCK_CONSUMPTIONS", "MOCK_CONTRACTS"]
+from .mock_data import MOCK, MockCustomer, MOCK_CUSTOMERS, MOCK_CONSUMPTIONS, MOCK_CONTRACTS, AVAILABLE_CUSTOMERS
 
+__all__ = ["MOCK", "MockCustomer", "MOCK_CUSTOMERS", "MOCK_CONSUMPTIONS", "MOCK_CONTRACTS", "AVAILABLE_CUSTOMERS"]
@@ -0,0 +1,58 @@
+"""
+Load curve parsing shared by the MCP server and the clustering script
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Values stay float64: the server rounds hourly means to 2 decimals and many
+# readings sit exactly on half-cent boundaries, which float32 would flip.
+LOADCURVE_DTYPE = [('timestamp', 'datetime64[s]'), ('value', np.float64)]
+
+
+def load_loadcurve(csv_path: Path) -> tuple:
+    """Load a load curve CSV as two numpy columns (timestamps, values).
+
+    The CSV is parsed only once: the result is cached in a binary .npy
+    mirror next to the CSV and reused as long as it is newer than the CSV
+    and has the current LOADCURVE_DTYPE.
+    """
+    cache_path = csv_path.with_suffix('.npy')
+    data = None
+    if cache_path.exists() and cache_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        try:
+            data = np.load(cache_path)
+        except (OSError, ValueError):
+            pass  # Unreadable mirror: rebuilt below
+        if data is not None and data.dtype != np.dtype(LOADCURVE_DTYPE):
+            data = None  # Written by an older loader version
+    if data is None:
+        with open(csv_path, 'r') as f:
+            header = f.readline().strip().split(',')
+        data = np.loadtxt(
+            csv_path, delimiter=',', skiprows=1,
+            usecols=(header.index('timestamp'), header.index('value')),
+            dtype=LOADCURVE_DTYPE
+        )
+        _save_mirror(cache_path, data)
+    return data['timestamp'], data['value']
+
+
+def _save_mirror(cache_path: Path, data: np.ndarray) -> None:
+    """Write a .npy mirror atomically, so an interrupted write never leaves
+    a truncated file in place. A read-only data dir is silently skipped."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.npy.tmp')
+    except OSError:
+        return  # Read-only data dir: parse again next time
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
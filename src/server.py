@@ -1,10 +1,11 @@
 """
 Enovos MCP Server - Customer Energy Data
 """
-import csv
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 from mcp.server.fastmcp import FastMCP
 from starlette.applications import Starlette
@@ -13,35 +14,156 @@ from starlette.responses import JSONResponse
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 import uvicorn
+import numpy as np
+
+from src.loadcurve import load_loadcurve
 
 mcp = FastMCP("enovos")
 DATA_DIR = Path(__file__).parent / "data"
 
 
+@lru_cache(maxsize=1024)
 def get_csv_path(customer_id: str) -> Path:
     padded_id = customer_id.zfill(5)
     return DATA_DIR / f"LU_ENO_DELPHI_LU_virtual_ind_{padded_id}.csv"
 
 
-def load_csv_data(customer_id: str, date_from: str, date_to: str) -> list:
+def _customer_file(customer_id: str) -> tuple:
+    """Return (csv_path, mtime_ns) for a customer, or None if it has no file.
+    
+    A single stat both checks existence and keys the per-file caches.
+    """
     csv_path = get_csv_path(customer_id)
-    if not csv_path.exists():
+    try:
+        return csv_path, csv_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
+
+
+def _parse_ymd(text: str) -> datetime:
+    """Parse a YYYY-MM-DD date; raises ValueError if malformed."""
+    parts = text.split('-')
+    if (len(parts) != 3 or len(parts[0]) != 4 or len(parts[1]) > 2 or len(parts[2]) > 2
+            or not all(p.isdigit() for p in parts)):
+        raise ValueError(f"Invalid date: {text!r}")
+    return datetime(int(parts[0]), int(parts[1]), int(parts[2]))
+
+
+def hourly_means(timestamps: np.ndarray, values: np.ndarray) -> tuple:
+    """Average the 15-min readings of each hour: (hour labels, means)."""
+    labels, bucket = np.unique(timestamps.astype('datetime64[h]'), return_inverse=True)
+    means = np.bincount(bucket, weights=values) / np.bincount(bucket)
+    return labels, means
+
+
+def rollup(labels: np.ndarray, sums: np.ndarray, unit: str) -> tuple:
+    """Sum per-period totals into coarser periods ('D' or 'M'): (labels, sums)."""
+    periods, bucket = np.unique(labels.astype(f'datetime64[{unit}]'), return_inverse=True)
+    return periods, np.bincount(bucket, weights=sums)
+
+
+@lru_cache(maxsize=256)
+def _customer_rollups(csv_path: Path, mtime_ns: int) -> dict:
+    # Only the rollups are kept: the raw 15-min arrays are released
+    hours = hourly_means(*load_loadcurve(csv_path))
+    days = rollup(*hours, 'D')
+    rollups = {'h': hours, 'D': days, 'M': rollup(*days, 'M')}
+    for labels, totals in rollups.values():
+        labels.flags.writeable = False
+        totals.flags.writeable = False
+    return rollups
+
+
+def load_consumption(customer_id: str, unit: str, start: datetime, end: datetime) -> tuple:
+    """Load a customer's consumption per hour ('h'), day ('D') or month ('M')
+    between two dates (inclusive).
     
-    try:
-        start_date = datetime.strptime(date_from, "%Y-%m-%d")
-        end_date = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
-    except ValueError:
-        return "invalid_date"
+    Hourly values are the mean of the 15-min readings, days and months the
+    sum of those. Rollups are computed once per file version and the window
+    is sliced out of them; monthly windows must start and end on month edges.
+    
+    Returns (labels, values) numpy arrays, or None if the customer is unknown.
+    """
+    customer_file = _customer_file(customer_id)
+    if customer_file is None:
+        return None
+    
+    start_date = np.datetime64(start, 'D')
+    end_date = np.datetime64(end, 'D') + 1
+    labels, totals = _customer_rollups(*customer_file)[unit]
+    lo, hi = np.searchsorted(labels, np.array([start_date, end_date]).astype(labels.dtype))
+    return labels[lo:hi], totals[lo:hi]
+
+
+def preload_customers() -> int:
+    """Parse every customer file and build its rollups and profile up front,
+    so tool calls are served from memory. Returns the number of customers
+    preloaded; unreadable files are reported and left to fail on request."""
+    def preload(csv_path: Path) -> bool:
+        try:
+            mtime_ns = csv_path.stat().st_mtime_ns
+            _customer_rollups(csv_path, mtime_ns)
+            _customer_profile(csv_path, mtime_ns)
+        except Exception as e:
+            print(f"Warning: could not preload {csv_path}: {e}")
+            return False
+        return True
+    
+    csv_paths = sorted(DATA_DIR.glob("LU_ENO_DELPHI_LU_virtual_ind_*.csv"))
+    # File reads and most numpy work release the GIL; past a few threads
+    # the disk, not the CPU, is the limit.
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        return sum(executor.map(preload, csv_paths))
+
+
+def format_hours(labels: np.ndarray) -> list:
+    """Format datetime64[h] labels as 'YYYY-MM-DD HH' strings."""
+    return [label.replace('T', ' ') for label in np.datetime_as_string(labels).tolist()]
+
+
+def _load_and_validate(customer_id: str, unit: str, date_from: str, date_to: str,
+                       max_days: int = None) -> tuple:
+    """Parse a consumption tool's date range and load its window.
     
-    data = []
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            ts = datetime.strptime(row['timestamp'], "%Y-%m-%d %H:%M:%S")
-            if start_date <= ts < end_date:
-                data.append({"timestamp": row['timestamp'], "value_kwh": float(row['value'])})
-    return data
+    Hourly ('h') and daily ('D') ranges are YYYY-MM-DD dates, monthly ('M')
+    ranges are YYYY-MM months covering whole months.
+    
+    Returns ((labels, values), None) on success, or (None, error dict).
+    """
+    try:
+        if unit == 'M':
+            start = _parse_ymd(date_from + "-01")
+            end_month = _parse_ymd(date_to + "-01")
+            # Last day of the end month: day 28 + 4 days always lands in the next month
+            end = (end_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        else:
+            start = _parse_ymd(date_from)
+            end = _parse_ymd(date_to)
+    except (ValueError, OverflowError):
+        return None, {"error": "Invalid date format. Use YYYY-MM" if unit == 'M' else "Invalid date format"}
+    if max_days is not None and (end - start).days > max_days:
+        return None, {"error": f"Max {max_days} days"}
+    
+    data = load_consumption(customer_id, unit, start, end)
+    if data is None:
+        return None, {"error": f"Customer {customer_id} not found"}
+    if not data[0].size:
+        return None, {"error": "No data for this period"}
+    return data, None
+
+
+def consumption_result(customer_id: str, granularity: str, labels: list, totals: np.ndarray) -> dict:
+    """Build a consumption tool response from period labels and their kWh."""
+    values = [round(kwh, 2) for kwh in totals.tolist()]
+    return {
+        "customer_id": customer_id,
+        "granularity": granularity,
+        "start": labels[0],
+        "end": labels[-1],
+        "unit": "kwh",
+        "total": round(sum(values), 2),
+        "values": values
+    }
 
 
 async def health(request):
@@ -57,39 +179,11 @@ def get_consumption_hourly(customer_id: str, date_from: str, date_to: str) -> di
         date_from: Start date YYYY-MM-DD
         date_to: End date YYYY-MM-DD (same as date_from for 1 day)
     """
-    try:
-        start = datetime.strptime(date_from, "%Y-%m-%d")
-        end = datetime.strptime(date_to, "%Y-%m-%d")
-        if (end - start).days > 7:
-            return {"error": "Max 7 days"}
-    except ValueError:
-        return {"error": "Invalid date format"}
-    
-    data = load_csv_data(customer_id, date_from, date_to)
-    if data is None:
-        return {"error": f"Customer {customer_id} not found"}
-    if data == "invalid_date":
-        return {"error": "Invalid date format"}
-    if not data:
-        return {"error": "No data for this period"}
-    
-    hourly = defaultdict(list)
-    for d in data:
-        hour = d['timestamp'][:13]
-        hourly[hour].append(d['value_kwh'])
-    
-    sorted_hours = sorted(hourly.keys())
-    values = [round(sum(hourly[h]) / len(hourly[h]), 2) for h in sorted_hours]
-    
-    return {
-        "customer_id": customer_id,
-        "granularity": "hourly",
-        "start": sorted_hours[0],
-        "end": sorted_hours[-1],
-        "unit": "kwh",
-        "total": round(sum(values), 2),
-        "values": values
-    }
+    data, error = _load_and_validate(customer_id, 'h', date_from, date_to, max_days=7)
+    if error:
+        return error
+    labels, means = data
+    return consumption_result(customer_id, "hourly", format_hours(labels), means)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -101,42 +195,11 @@ def get_consumption_daily(customer_id: str, date_from: str, date_to: str) -> dic
         date_from: Start date YYYY-MM-DD
         date_to: End date YYYY-MM-DD
     """
-    try:
-        start = datetime.strptime(date_from, "%Y-%m-%d")
-        end = datetime.strptime(date_to, "%Y-%m-%d")
-        if (end - start).days > 90:
-            return {"error": "Max 90 days"}
-    except ValueError:
-        return {"error": "Invalid date format"}
-    
-    data = load_csv_data(customer_id, date_from, date_to)
-    if data is None:
-        return {"error": f"Customer {customer_id} not found"}
-    if data == "invalid_date":
-        return {"error": "Invalid date format"}
-    if not data:
-        return {"error": "No data for this period"}
-    
-    hourly = defaultdict(list)
-    for d in data:
-        hourly[d['timestamp'][:13]].append(d['value_kwh'])
-    
-    daily = defaultdict(float)
-    for hour, vals in hourly.items():
-        daily[hour[:10]] += sum(vals) / len(vals)
-    
-    sorted_days = sorted(daily.keys())
-    values = [round(daily[d], 2) for d in sorted_days]
-    
-    return {
-        "customer_id": customer_id,
-        "granularity": "daily",
-        "start": sorted_days[0],
-        "end": sorted_days[-1],
-        "unit": "kwh",
-        "total": round(sum(values), 2),
-        "values": values
-    }
+    data, error = _load_and_validate(customer_id, 'D', date_from, date_to, max_days=90)
+    if error:
+        return error
+    days, totals = data
+    return consumption_result(customer_id, "daily", np.datetime_as_string(days).tolist(), totals)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -148,48 +211,11 @@ def get_consumption_monthly(customer_id: str, date_from: str, date_to: str) -> d
         date_from: Start month YYYY-MM
         date_to: End month YYYY-MM
     """
-    try:
-        start = datetime.strptime(date_from + "-01", "%Y-%m-%d")
-        end_month = datetime.strptime(date_to + "-01", "%Y-%m-%d")
-        if end_month.month == 12:
-            end = datetime(end_month.year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end = datetime(end_month.year, end_month.month + 1, 1) - timedelta(days=1)
-    except ValueError:
-        return {"error": "Invalid date format. Use YYYY-MM"}
-    
-    data = load_csv_data(customer_id, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
-    if data is None:
-        return {"error": f"Customer {customer_id} not found"}
-    if data == "invalid_date":
-        return {"error": "Invalid date format"}
-    if not data:
-        return {"error": "No data for this period"}
-    
-    hourly = defaultdict(list)
-    for d in data:
-        hourly[d['timestamp'][:13]].append(d['value_kwh'])
-    
-    daily = defaultdict(float)
-    for hour, vals in hourly.items():
-        daily[hour[:10]] += sum(vals) / len(vals)
-    
-    monthly = defaultdict(float)
-    for date, kwh in daily.items():
-        monthly[date[:7]] += kwh
-    
-    sorted_months = sorted(monthly.keys())
-    values = [round(monthly[m], 2) for m in sorted_months]
-    
-    return {
-        "customer_id": customer_id,
-        "granularity": "monthly",
-        "start": sorted_months[0],
-        "end": sorted_months[-1],
-        "unit": "kwh",
-        "total": round(sum(values), 2),
-        "values": values
-    }
+    data, error = _load_and_validate(customer_id, 'M', date_from, date_to)
+    if error:
+        return error
+    months, totals = data
+    return consumption_result(customer_id, "monthly", np.datetime_as_string(months).tolist(), totals)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -203,18 +229,17 @@ def get_annual_summary(customer_id: str, year: int) -> dict:
         year: The year to analyze (e.g. 2023)
     """
     def calc_year_total(cid: str, y: int) -> float:
-        data = load_csv_data(cid, f"{y}-01-01", f"{y}-12-31")
-        if not data or data == "invalid_date":
+        try:
+            data = load_consumption(cid, 'h', datetime(y, 1, 1), datetime(y, 12, 31))
+        except (ValueError, OverflowError):
+            return None  # Year out of datetime range
+        if data is None or not data[0].size:
             return None
-        hourly = defaultdict(list)
-        for d in data:
-            hourly[d['timestamp'][:13]].append(d['value_kwh'])
-        daily_total = sum(sum(v)/len(v) for v in hourly.values())
-        return round(daily_total, 0)
+        _, means = data
+        return round(float(means.sum()), 0)
     
     # Check customer exists
-    csv_path = get_csv_path(customer_id)
-    if not csv_path.exists():
+    if _customer_file(customer_id) is None:
         return {"error": f"Customer {customer_id} not found"}
     
     current = calc_year_total(customer_id, year)
@@ -230,42 +255,29 @@ def get_annual_summary(customer_id: str, year: int) -> dict:
     }
 
 
-@mcp.tool(annotations={"readOnlyHint": True})
-def get_customer_profile(customer_id: str) -> dict:
-    """Get customer consumption profile with automatic classification.
-    
-    Args:
-        customer_id: Required. The customer's unique identifier
-    """
-    csv_path = get_csv_path(customer_id)
-    if not csv_path.exists():
-        return {"error": f"Customer {customer_id} not found"}
-    
-    hourly_values = defaultdict(list)
-    monthly_values = defaultdict(list)
-    total_kwh = 0
-    
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            hour = int(row['timestamp'][11:13])
-            month = int(row['timestamp'][5:7])
-            value = float(row['value'])
-            hourly_values[hour].append(value)
-            monthly_values[month].append(value)
-            total_kwh += value
+@lru_cache(maxsize=256)
+def _customer_profile(csv_path: Path, mtime_ns: int) -> dict:
+    timestamps, readings = load_loadcurve(csv_path)
+    hours = timestamps.astype(np.int64) // 3600 % 24
+    months = timestamps.astype('datetime64[M]').astype(np.int64) % 12 + 1
     
+    hour_sums = np.bincount(hours, weights=readings, minlength=24)
+    hour_counts = np.bincount(hours, minlength=24)
     hourly_profile = [
-        round(sum(hourly_values[h]) / len(hourly_values[h]), 2) if hourly_values[h] else 0
-        for h in range(24)
+        round(total / count, 2) if count else 0
+        for total, count in zip(hour_sums.tolist(), hour_counts.tolist())
     ]
     
-    winter_vals = [v for m in [11, 12, 1, 2] for v in monthly_values.get(m, [])]
-    summer_vals = [v for m in [6, 7, 8] for v in monthly_values.get(m, [])]
+    month_sums = np.bincount(months, weights=readings, minlength=13)
+    month_counts = np.bincount(months, minlength=13)
     
-    winter_avg = sum(winter_vals) / len(winter_vals) if winter_vals else 1
-    summer_avg = sum(summer_vals) / len(summer_vals) if summer_vals else 1
-    ratio = round(winter_avg / summer_avg, 2) if summer_avg > 0 else 1.0
+    def season_avg(season_months: list) -> float:
+        count = month_counts[season_months].sum()
+        return month_sums[season_months].sum() / count if count else 1
+    
+    winter_avg = season_avg([11, 12, 1, 2])
+    summer_avg = season_avg([6, 7, 8])
+    ratio = round(float(winter_avg / summer_avg), 2) if summer_avg > 0 else 1.0
     
     # Classify profile
     night_hours = [19, 20, 21, 22, 23, 0, 1, 2, 3, 4, 5]
@@ -284,14 +296,35 @@ def get_customer_profile(customer_id: str) -> dict:
         profile_type = "residential"
     
     return {
-        "customer_id": customer_id.zfill(5),
         "profile_type": profile_type,
         "hourly_profile": hourly_profile,
         "ratio_winter_summer": ratio,
-        "total_kwh": round(total_kwh, 0)
+        "total_kwh": round(float(month_sums.sum()), 0)
     }
 
 
+@mcp.tool(annotations={"readOnlyHint": True})
+def get_customer_profile(customer_id: str) -> dict:
+    """Get customer consumption profile with automatic classification.
+    
+    Args:
+        customer_id: Required. The customer's unique identifier
+    """
+    customer_file = _customer_file(customer_id)
+    if customer_file is None:
+        return {"error": f"Customer {customer_id} not found"}
+    
+    profile = _customer_profile(*customer_file)
+    return {"customer_id": customer_id.zfill(5), **profile}
+
+
+_CONTRACT_BASE = {
+    "contract": "Naturstrom Fix",
+    "price_kwh": 0.25,
+    "start_date": "2022-01-01"
+}
+
+
 @mcp.tool(annotations={"readOnlyHint": True})
 def get_customer_contract(customer_id: str) -> dict:
     """Get customer's current energy contract.
@@ -299,16 +332,48 @@ def get_customer_contract(customer_id: str) -> dict:
     Args:
         customer_id: Required. The customer's unique identifier
     """
-    csv_path = get_csv_path(customer_id)
-    if not csv_path.exists():
+    if _customer_file(customer_id) is None:
         return {"error": f"Customer {customer_id} not found"}
     
-    return {
-        "customer_id": customer_id.zfill(5),
-        "contract": "Naturstrom Fix",
-        "price_kwh": 0.25,
-        "start_date": "2022-01-01"
-    }
+    return {"customer_id": customer_id.zfill(5), **_CONTRACT_BASE}
+
+
+_OFFERS = {
+    "offers": [
+        {
+            "name": "Naturstrom Fix",
+            "price_eur_kwh": 0.25,
+            "type": "fixed",
+            "ideal_for": "heat_pump",
+            "description": "Fixed price, 100% renewable, price security"
+        },
+        {
+            "name": "Naturstrom Drive",
+            "price_night_eur_kwh": 0.15,
+            "price_day_eur_kwh": 0.28,
+            "night_hours": "22:00-06:00",
+            "type": "dual",
+            "ideal_for": "ev",
+            "description": "Optimized for EV charging, -40% at night"
+        },
+        {
+            "name": "Energy Sharing",
+            "base_price_eur_kwh": 0.25,
+            "network_fee_savings": "up to 10%",
+            "type": "p2p",
+            "ideal_for": "office",
+            "description": "Share with a local partner, save up to 10% on network fees",
+            "how_it_works": "Find partner nearby → share production → both reduce grid fees"
+        },
+        {
+            "name": "Nova Naturstroum",
+            "price_eur_kwh": 0.23,
+            "type": "green",
+            "ideal_for": "residential",
+            "description": "100% local renewable energy"
+        }
+    ]
+}
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -318,42 +383,25 @@ def get_enovos_offers() -> dict:
     Use this to see all offers and compare with customer's current contract.
     Each offer has an 'ideal_for' field matching profile types from get_customer_profile.
     """
-    return {
-        "offers": [
-            {
-                "name": "Naturstrom Fix",
-                "price_eur_kwh": 0.25,
-                "type": "fixed",
-                "ideal_for": "heat_pump",
-                "description": "Fixed price, 100% renewable, price security"
-            },
-            {
-                "name": "Naturstrom Drive",
-                "price_night_eur_kwh": 0.15,
-                "price_day_eur_kwh": 0.28,
-                "night_hours": "22:00-06:00",
-                "type": "dual",
-                "ideal_for": "ev",
-                "description": "Optimized for EV charging, -40% at night"
-            },
-            {
-                "name": "Energy Sharing",
-                "base_price_eur_kwh": 0.25,
-                "network_fee_savings": "up to 10%",
-                "type": "p2p",
-                "ideal_for": "office",
-                "description": "Share with a local partner, save up to 10% on network fees",
-                "how_it_works": "Find partner nearby → share production → both reduce grid fees"
-            },
-            {
-                "name": "Nova Naturstroum",
-                "price_eur_kwh": 0.23,
-                "type": "green",
-                "ideal_for": "residential",
-                "description": "100% local renewable energy"
-            }
-        ]
-    }
+    return _OFFERS
+
+
+_ADVICE_BASE = {
+    "workflow": [
+        "1. Call get_customer_profile(customer_id) to get profile_type",
+        "2. Call get_customer_contract(customer_id) to get current contract",
+        "3. Call get_enovos_offers() to see all offers with ideal_for field",
+        "4. Compare: find offer where ideal_for == profile_type",
+        "5. If current contract != recommended offer → suggest switching",
+        "6. Also call get_challenges() to check ongoing energy challenges with rewards!"
+    ],
+    "generic_tips": [
+        "Shift consumption to off-peak hours",
+        "Install smart thermostat",
+        "Check for energy-efficient appliances",
+        "Consider solar panels"
+    ]
+}
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -373,23 +421,44 @@ def get_advice(customer_id: str) -> dict:
     Args:
         customer_id: Required. The customer's unique identifier
     """
-    return {
-        "workflow": [
-            "1. Call get_customer_profile(customer_id) to get profile_type",
-            "2. Call get_customer_contract(customer_id) to get current contract",
-            "3. Call get_enovos_offers() to see all offers with ideal_for field",
-            "4. Compare: find offer where ideal_for == profile_type",
-            "5. If current contract != recommended offer → suggest switching",
-            "6. Also call get_challenges() to check ongoing energy challenges with rewards!"
-        ],
-        "generic_tips": [
-            "Shift consumption to off-peak hours",
-            "Install smart thermostat",
-            "Check for energy-efficient appliances",
-            "Consider solar panels"
-        ],
-        "customer_id": customer_id
-    }
+    return {**_ADVICE_BASE, "customer_id": customer_id}
+
+
+_CHALLENGES = {
+    "active_challenges": [
+        {
+            "name": "Peak Hour Challenge",
+            "period": "December 2024",
+            "goal": "Reduce consumption between 19:00-20:00",
+            "why": "This is peak demand hour - reducing helps the grid!",
+            "reward": "10€ bill credit",
+            "how_to_win": "Reduce your 19:00-20:00 consumption by 20% vs last month",
+            "participants": 1247,
+            "status": "active"
+        },
+        {
+            "name": "Weekend Warrior",
+            "period": "December 2024", 
+            "goal": "Shift laundry/dishwasher to weekends",
+            "why": "Lower demand on weekends = greener energy mix",
+            "reward": "5€ bill credit + Green Badge",
+            "how_to_win": "Run 80% of appliances on Sat-Sun",
+            "participants": 892,
+            "status": "active"
+        },
+        {
+            "name": "Night Owl Saver",
+            "period": "Coming January 2025",
+            "goal": "Shift consumption to 22:00-06:00",
+            "why": "Night = cheaper & greener electricity",
+            "reward": "15€ bill credit",
+            "how_to_win": "Move 30% of consumption to night hours",
+            "participants": 0,
+            "status": "upcoming"
+        }
+    ],
+    "join_message": "Want to participate? Just start saving - we track automatically!"
+}
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -401,41 +470,40 @@ def get_challenges() -> dict:
     
     Check this when customer asks about saving energy or tips.
     """
-    return {
-        "active_challenges": [
-            {
-                "name": "Peak Hour Challenge",
-                "period": "December 2024",
-                "goal": "Reduce consumption between 19:00-20:00",
-                "why": "This is peak demand hour - reducing helps the grid!",
-                "reward": "10€ bill credit",
-                "how_to_win": "Reduce your 19:00-20:00 consumption by 20% vs last month",
-                "participants": 1247,
-                "status": "active"
-            },
-            {
-                "name": "Weekend Warrior",
-                "period": "December 2024", 
-                "goal": "Shift laundry/dishwasher to weekends",
-                "why": "Lower demand on weekends = greener energy mix",
-                "reward": "5€ bill credit + Green Badge",
-                "how_to_win": "Run 80% of appliances on Sat-Sun",
-                "participants": 892,
-                "status": "active"
-            },
-            {
-                "name": "Night Owl Saver",
-                "period": "Coming January 2025",
-                "goal": "Shift consumption to 22:00-06:00",
-                "why": "Night = cheaper & greener electricity",
-                "reward": "15€ bill credit",
-                "how_to_win": "Move 30% of consumption to night hours",
-                "participants": 0,
-                "status": "upcoming"
-            }
-        ],
-        "join_message": "Want to participate? Just start saving - we track automatically!"
-    }
+    return _CHALLENGES
+
+
+_PARTNERS_BASE = {
+    "your_profile": "High daytime consumption (office)",
+    "matching_producers": [
+        {
+            "id": "PROD-2847",
+            "type": "Residential with solar (6 kWp)",
+            "district": "Kirchberg",
+            "available_kwh_month": 450,
+            "potential_savings_percent": 9,
+            "status": "Available"
+        },
+        {
+            "id": "PROD-1923",
+            "type": "Residential with solar (4 kWp)",
+            "district": "Limpertsberg",
+            "available_kwh_month": 320,
+            "potential_savings_percent": 7,
+            "status": "Available"
+        },
+        {
+            "id": "PROD-5561",
+            "type": "Residential with solar (8 kWp)",
+            "district": "Gasperich",
+            "available_kwh_month": 600,
+            "potential_savings_percent": 10,
+            "status": "Available"
+        }
+    ],
+    "how_it_works": "These residents produce solar energy during the day when you consume. Perfect match!",
+    "next_step": "Use signal_interest to notify Enovos"
+}
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -451,38 +519,17 @@ def find_sharing_partners(customer_id: str) -> dict:
     Args:
         customer_id: Required. The customer's unique identifier
     """
-    return {
-        "customer_id": customer_id,
-        "your_profile": "High daytime consumption (office)",
-        "matching_producers": [
-            {
-                "id": "PROD-2847",
-                "type": "Residential with solar (6 kWp)",
-                "district": "Kirchberg",
-                "available_kwh_month": 450,
-                "potential_savings_percent": 9,
-                "status": "Available"
-            },
-            {
-                "id": "PROD-1923",
-                "type": "Residential with solar (4 kWp)",
-                "district": "Limpertsberg",
-                "available_kwh_month": 320,
-                "potential_savings_percent": 7,
-                "status": "Available"
-            },
-            {
-                "id": "PROD-5561",
-                "type": "Residential with solar (8 kWp)",
-                "district": "Gasperich",
-                "available_kwh_month": 600,
-                "potential_savings_percent": 10,
-                "status": "Available"
-            }
-        ],
-        "how_it_works": "These residents produce solar energy during the day when you consume. Perfect match!",
-        "next_step": "Use signal_interest to notify Enovos"
-    }
+    return {"customer_id": customer_id, **_PARTNERS_BASE}
+
+
+_INTEREST_DETAILS = {
+    "next_steps": [
+        "Enovos will verify eligibility",
+        "Both parties will be contacted within 48h",
+        "Contract adjustment and partnership activation"
+    ],
+    "estimated_savings": "Up to 10% on network fees"
+}
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -502,12 +549,7 @@ def signal_interest(customer_id: str, producer_id: str) -> dict:
         "message": "Your interest has been registered!",
         "customer_id": customer_id,
         "producer_id": producer_id,
-        "next_steps": [
-            "Enovos will verify eligibility",
-            "Both parties will be contacted within 48h",
-            "Contract adjustment and partnership activation"
-        ],
-        "estimated_savings": "Up to 10% on network fees",
+        **_INTEREST_DETAILS,
         "reference": f"ES-{customer_id}-{producer_id}"
     }
 
@@ -545,5 +587,9 @@ if __name__ == "__main__":
     print("  - signal_interest")
     print("  - get_challenges")
     print("=" * 50)
+    print(f"Preloaded {preload_customers()} customers")
     
+    # uvicorn picks uvloop and httptools when installed (uvicorn[standard]).
+    # Single worker: SSE sessions live in process memory, so the POSTed
+    # messages must reach the worker holding the event stream.
     uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
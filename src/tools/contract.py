@@ -1,7 +1,7 @@
 """
 Tool for retrieving customer contract data
 """
-from src.data.mock_data import get_contract_by_customer_id
+from src.data.mock_data import get_contract_by_customer_id, AVAILABLE_CUSTOMERS
 
 
 def get_customer_contract(customer_id: str) -> dict:
@@ -20,7 +20,7 @@ def get_customer_contract(customer_id: str) -> dict:
         return {
             "error": f"Contrat pour le client {customer_id} non trouvé",
             "customer_id": customer_id,
-            "available_customers": ["C001", "C002", "C003"]
+            "available_customers": AVAILABLE_CUSTOMERS
         }
     
     return contract